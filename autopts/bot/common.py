@@ -21,6 +21,7 @@ import subprocess
 import sys
 import mimetypes
 import shutil
+import urllib.request
 import zipfile
 import smtplib
 import datetime
@@ -31,7 +32,7 @@ from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 
-from xmlrpc.client import ServerProxy
+from xmlrpc.client import Fault, ServerProxy
 import git
 import yaml
 import xlsxwriter
@@ -52,6 +53,8 @@ CLIENT_SECRET_FILE = 'client_secret.json'
 REPORT_XLSX = "report.xlsx"
 REPORT_TXT = "report.txt"
 COMMASPACE = ', '
+COPY_CHUNK_SIZE = 1024 * 1024
+LIST_PAGE_SIZE = 1000
 
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ERRATA_DIR_PATH = os.path.join(os.path.dirname(PROJECT_DIR), 'errata')
@@ -871,6 +874,95 @@ def split_xml_filename(file_path):
     return test_name, timestamp
 
 
+def is_unsupported_method(fault, method):
+    """Check if xmlrpc fault was raised by a server not providing the method.
+    :param fault: xmlrpc.client.Fault
+    :param method: name of the called method
+    """
+    return 'method "{}" is not supported'.format(method) in fault.faultString
+
+
+def list_server_workspace_tree(proxy, workspace_dir):
+    """List workspace tree of auto-pts server page by page. Falls back to
+    single list_workspace_tree call on servers without paging.
+    :param proxy: auto-pts server proxy
+    :param workspace_dir: workspace name or path on the server
+    :return: paths of the workspace content followed by the workspace root
+    """
+    file_list = []
+    cursor = None
+    while True:
+        try:
+            cursor, page = proxy.list_workspace_tree_page(workspace_dir, cursor,
+                                                          LIST_PAGE_SIZE)
+        except Fault as fault:
+            if not is_unsupported_method(fault, 'list_workspace_tree_page'):
+                raise
+            return proxy.list_workspace_tree(workspace_dir)
+
+        file_list.extend(page)
+        if cursor is None:
+            return file_list
+
+
+def copy_server_file(proxy, server_url, src_path, dst_path):
+    """Download file from auto-pts server over plain HTTP. Interrupted
+    download is completed with copy_file_chunk calls. Falls back to
+    copy_file call on servers without HTTP downloads.
+    :param proxy: auto-pts server proxy
+    :param server_url: auto-pts server URL, e.g. http://address:port
+    :param src_path: path of the file on the server
+    :param dst_path: local destination path
+    :return: False if src_path is not a file, True otherwise
+    """
+    try:
+        download_url = proxy.get_download_url(src_path)
+    except Fault as fault:
+        if not is_unsupported_method(fault, 'get_download_url'):
+            raise
+
+        file_bin = proxy.copy_file(src_path)
+        if file_bin is None:
+            return False
+
+        Path(os.path.dirname(dst_path)).mkdir(parents=True, exist_ok=True)
+        with open(dst_path, 'wb') as handle:
+            handle.write(file_bin.data)
+        return True
+
+    if download_url is None:
+        return False
+
+    Path(os.path.dirname(dst_path)).mkdir(parents=True, exist_ok=True)
+
+    # Connect directly like xmlrpc.client does, ignoring http_proxy settings
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    with opener.open(server_url + download_url) as response, \
+            open(dst_path, 'wb') as handle:
+        file_size = int(response.headers['Content-Length'])
+        shutil.copyfileobj(response, handle, COPY_CHUNK_SIZE)
+
+        # Connection closed early, e.g. by server restart, fetch the rest
+        # in chunks over XML-RPC
+        if handle.tell() != file_size:
+            file_size = proxy.file_size(src_path)
+            while file_size is not None and handle.tell() < file_size:
+                file_bin = proxy.copy_file_chunk(src_path, handle.tell(),
+                                                 COPY_CHUNK_SIZE)
+                if not file_bin or not file_bin.data:
+                    break
+                handle.write(file_bin.data)
+
+        copied = handle.tell()
+
+    # Incomplete copy must not let the caller delete the remote file
+    if copied != file_size:
+        raise Exception('Copied {} of {} bytes of {}'.format(copied, file_size,
+                                                             src_path))
+
+    return True
+
+
 def pull_server_logs(args):
     """Copy Bluetooth Protocol Viewer logs from auto-pts servers.
     :param args: args
@@ -898,9 +990,9 @@ def pull_server_logs(args):
             continue
         last_xml = ('', '')
 
-        with ServerProxy("http://{}:{}/".format(server_addr[i], server_port[i]),
-                         allow_none=True, ) as proxy:
-            file_list = proxy.list_workspace_tree(workspace_dir)
+        server_url = "http://{}:{}".format(server_addr[i], server_port[i])
+        with ServerProxy(server_url + "/", allow_none=True, ) as proxy:
+            file_list = list_server_workspace_tree(proxy, workspace_dir)
 
             if args.cron_optim:
                 proxy.shutdown_pts_bpv()
@@ -913,25 +1005,25 @@ def pull_server_logs(args):
                 file_path = file_list.pop(0)
                 xml_file_path = file_path
                 try:
-                    file_bin = proxy.copy_file(file_path)
+                    local_path = '/'.join([logs_folder,
+                                           file_path[len(workspace_root) + 1:]
+                                          .replace('\\', '/')])
+                    is_file = copy_server_file(proxy, server_url, file_path,
+                                               local_path)
 
                     if not any(file_path.endswith(ext) for ext in ['.pts', '.pqw6', '.xlsx', '.gitignore']):
                         proxy.delete_file(file_path)
 
-                    if file_bin is None:
+                    if not is_file:
                         continue
 
-                    file_path = '/'.join([logs_folder,
-                                          file_path[len(workspace_root) + 1:]
-                                         .replace('\\', '/')])
-                    Path(os.path.dirname(file_path)).mkdir(parents=True,
-                                                           exist_ok=True)
-
-                    with open(file_path, 'wb') as handle:
-                        handle.write(file_bin.data)
+                    file_path = local_path
+                    passed = False
+                    if file_path.endswith('.xml') and not 'tc_log' in file_path:
+                        with open(file_path, 'rb') as handle:
+                            passed = b'Final Verdict:PASS' in handle.read()
 
-                    if file_path.endswith('.xml') and not 'tc_log' in file_path \
-                            and b'Final Verdict:PASS' in file_bin.data:
+                    if passed:
                         (test_name, timestamp) = split_xml_filename(file_path)
                         if test_name in last_xml[0]:
                             if timestamp <= last_xml[1]:
@@ -945,8 +1037,7 @@ def pull_server_logs(args):
                         Path(os.path.dirname(xml_file_path)).mkdir(
                             parents=True,
                             exist_ok=True)
-                        with open(xml_file_path, 'wb') as handle:
-                            handle.write(file_bin.data)
+                        shutil.copyfile(file_path, xml_file_path)
                         last_xml = (xml_file_path, timestamp)
                 except BaseException as e:
                     logging.exception(e)
@@ -294,7 +294,7 @@ class PyPTS:
         self._recov_in_progress = False
 
         self._temp_workspace_path = None
-        self.last_start_time = time.time()
+        self.last_start_time = time.monotonic()
 
         self._pts = None
         self._pts_proc = None
@@ -646,7 +646,7 @@ class PyPTS:
         log("Starting %s %s %s", self.run_test_case.__name__, project_name,
             test_case_name)
 
-        self.last_start_time = time.time()
+        self.last_start_time = time.monotonic()
 
         self._pts_logger.set_test_case_name(test_case_name)
 
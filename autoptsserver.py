@@ -29,20 +29,26 @@
 #
 
 import argparse
-import copy
+import itertools
 import logging
+import multiprocessing
 import os
 import shutil
+import socket
+import socketserver
 import subprocess
 import sys
 import threading
 import time
 import traceback
+import urllib.parse
 import xmlrpc.client
 import xmlrpc.server
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from os.path import dirname, abspath
 from pathlib import Path
-from time import sleep
+from queue import SimpleQueue, Empty
 
 import pythoncom
 import win32com
@@ -51,11 +57,17 @@ import wmi
 from autopts import winutils, ptscontrol
 
 from autopts.config import SERVER_PORT
-from autopts.utils import usb_power
+from autopts.utils import PTS_WORKSPACE_FILE_EXT, usb_power
 
 log = logging.debug
+LOG_FORMAT = '%(threadName)s %(asctime)s %(name)s %(levelname)s : %(message)s'
 PROJECT_DIR = dirname(abspath(__file__))
 PTS_START_LOCK = threading.RLock()
+_wmi_local = threading.local()
+_workspace_cache = None
+_workspace_lock = threading.Lock()
+TREE_CURSOR_TIMEOUT = 60
+TREE_CURSORS_MAX = 16
 
 
 def server_start_lock_wrapper(func):
@@ -103,8 +115,11 @@ class PyPTSWithXmlRpcCallback(ptscontrol.PyPTS):
             "http://{}:{}/".format(self.client_address, self.client_port),
             allow_none=True)
 
-        log("Created XMR RPC auto-pts client proxy, provides methods: %s" %
-            self.client_xmlrpc_proxy.system.listMethods())
+        # Listing the methods is a round trip to the client, skip it unless
+        # it gets logged
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            log("Created XMR RPC auto-pts client proxy, provides methods: %s",
+                self.client_xmlrpc_proxy.system.listMethods())
 
         self.register_ptscallback(self.client_xmlrpc_proxy)
 
@@ -120,6 +135,125 @@ class PyPTSWithXmlRpcCallback(ptscontrol.PyPTS):
         self.client_xmlrpc_proxy = None
 
 
+class KeepAliveRequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    """Keeps client connection open between requests. Besides XML-RPC POST
+    requests serves files for GET /file?path=<file path>, which avoids base64
+    encoding of copy_file."""
+    protocol_version = 'HTTP/1.1'
+    copy_chunk_size = 64 * 1024
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        file_path = urllib.parse.parse_qs(url.query).get('path', [None])[0]
+
+        if url.path != '/file' or not file_path or not os.path.isfile(file_path):
+            self.send_error(404)
+            return
+
+        with open(file_path, 'rb') as handle:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(os.fstat(handle.fileno()).st_size))
+            self.end_headers()
+            shutil.copyfileobj(handle, self.wfile, self.copy_chunk_size)
+
+
+class ThreadingXMLRPCServer(socketserver.ThreadingMixIn,
+                            xmlrpc.server.SimpleXMLRPCServer):
+    """XML-RPC server handling each request in its own thread.
+
+    Registered functions run in the request threads. Calls to the registered
+    instance are queued and executed by handle_instance_call, because PTS COM
+    objects can only be used from the thread that created them. After
+    reject_requests all requests fail, so nothing reaches a PTS instance that
+    is being torn down.
+    """
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance_calls = SimpleQueue()
+        self._lock = threading.Lock()
+        self._rejecting = False
+        self._connections = set()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self._connections.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self._lock:
+            self._connections.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.close_connections()
+
+    def close_connections(self):
+        """Wakes up handlers waiting on kept alive connections, so clients
+        reconnect to the restarted server"""
+        with self._lock:
+            connections = list(self._connections)
+        for request in connections:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _dispatch(self, method, params):
+        with self._lock:
+            if self._rejecting:
+                raise Exception('Server is being restarted')
+
+        if method in self.funcs:
+            return super()._dispatch(method, params)
+
+        result = SimpleQueue()
+        with self._lock:
+            if self._rejecting:
+                raise Exception('Server is being restarted')
+            self.instance_calls.put((method, params, result))
+        ok, value = result.get()
+        if ok:
+            return value
+        raise value
+
+    def handle_instance_call(self, timeout=None):
+        """Executes single queued instance call, waits up to timeout for it"""
+        try:
+            call = self.instance_calls.get(timeout=timeout)
+        except Empty:
+            return
+
+        # Woken up by reject_requests
+        if call is None:
+            return
+
+        method, params, result = call
+        try:
+            result.put((True, super()._dispatch(method, params)))
+        except BaseException as exc:
+            result.put((False, exc))
+
+    def reject_requests(self):
+        """Fails queued and all further requests and wakes up
+        handle_instance_call"""
+        with self._lock:
+            self._rejecting = True
+
+        while True:
+            try:
+                call = self.instance_calls.get_nowait()
+            except Empty:
+                break
+            if call is not None:
+                call[2].put((False, Exception('Server is being restarted')))
+
+        self.instance_calls.put(None)
+
+
 class SvrArgumentParser(argparse.ArgumentParser):
     def __init__(self, description):
         argparse.ArgumentParser.__init__(self, description=description)
@@ -145,6 +279,11 @@ class SvrArgumentParser(argparse.ArgumentParser):
                                r'"Device instance path" in device settings, e.g. '
                                r'"USB\VID_0A12&PID_0001\5&A70BC4C&0&8"')
 
+        self.add_argument("--multiprocess", action='store_true', default=False,
+                          help="Run each server in its own process instead of "
+                          "a thread. Every process logs to its own file and "
+                          "super guard watches its servers separately.")
+
     @staticmethod
     def check_args(arg):
         """Sanity check command line arguments"""
@@ -167,18 +306,123 @@ class SvrArgumentParser(argparse.ArgumentParser):
         return arg
 
 
+def scan_workspaces():
+    """Maps directory names under workspaces to their paths, the shallowest
+    directory wins if a name repeats. Directories holding a workspace file
+    are not descended into, so PTS log trees are not scanned."""
+    workspaces = {}
+    dirs = deque([os.path.join(PROJECT_DIR, 'autopts/workspaces')])
+    while dirs:
+        subdirs = []
+        is_workspace = False
+        with os.scandir(dirs.popleft()) as iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=False):
+                    workspaces.setdefault(entry.name, entry.path)
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(PTS_WORKSPACE_FILE_EXT):
+                    is_workspace = True
+
+        if not is_workspace:
+            dirs.extend(subdirs)
+    return workspaces
+
+
 def get_workspace(workspace):
-    for root, dirs, files in os.walk(os.path.join(PROJECT_DIR, 'autopts/workspaces'),
-                                     topdown=True):
-        for name in dirs:
-            if name == workspace:
-                return os.path.join(root, name)
-    return None
+    global _workspace_cache
+
+    with _workspace_lock:
+        path = None
+        if _workspace_cache is not None:
+            path = _workspace_cache.get(workspace)
+
+        # Rescan if the workspace was added or removed since the last scan
+        if path is None or not os.path.isdir(path):
+            _workspace_cache = scan_workspaces()
+            path = _workspace_cache.get(workspace)
+
+    return path
+
+
+def clear_workspace_cache():
+    global _workspace_cache
+
+    with _workspace_lock:
+        _workspace_cache = None
+
+
+def walk_workspace_tree(directory):
+    """Yields paths of all files and directories under directory, each
+    directory after its content"""
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_workspace_tree(entry.path)
+            yield entry.path
 
 
-def kill_all_processes(name):
-    c = wmi.WMI()
-    for ps in c.Win32_Process(name=name):
+def find_workspace_root(workspace_dir):
+    """Returns directory of the workspace given by name or absolute path"""
+    if Path(workspace_dir).is_absolute():
+        return workspace_dir
+
+    logs_root = get_workspace(workspace_dir)
+    if logs_root is None:
+        logging.error("Workspace %s not found", workspace_dir)
+        raise Exception("Workspace {} not found".format(workspace_dir))
+
+    return logs_root
+
+
+def iter_workspace_tree(logs_root):
+    """Yields paths of the workspace content and then the workspace root"""
+    if not os.path.isdir(logs_root):
+        return
+
+    yield from walk_workspace_tree(logs_root)
+    yield logs_root
+
+
+class WorkspaceTreeCursor:
+    """Workspace tree listing resumed by list_workspace_tree_page"""
+
+    def __init__(self, workspace_dir):
+        self.iterator = iter_workspace_tree(find_workspace_root(workspace_dir))
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Closes scandir handles of the listing, returns False if the
+        listing is being read right now"""
+        if not self.lock.acquire(blocking=False):
+            return False
+        try:
+            self.iterator.close()
+        finally:
+            self.lock.release()
+        return True
+
+
+def _wmi():
+    """Returns WMI connection of the calling thread, COM objects must not be
+    shared between apartments"""
+    if not hasattr(_wmi_local, 'c'):
+        _wmi_local.c = wmi.WMI()
+    return _wmi_local.c
+
+
+def kill_all_processes(name, use_wmi=False):
+    if not use_wmi:
+        try:
+            proc = subprocess.run(['taskkill', '/F', '/IM', name, '/T'],
+                                  stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL, check=False)
+            log("taskkill %s finished with %d" % (name, proc.returncode))
+            return
+        except OSError as exc:
+            logging.exception(exc)
+
+    for ps in _wmi().Win32_Process(name=name):
         try:
             ps.Terminate()
             log("%s process (PID %d) terminated successfully" % (name, ps.ProcessId))
@@ -188,17 +432,25 @@ def kill_all_processes(name):
 
 
 def delete_workspaces():
-    def recursive(directory, depth):
+    root = os.path.join(PROJECT_DIR, 'autopts/workspaces')
+    try:
+        with os.scandir(root) as iterator:
+            if next(iterator, None) is None:
+                return
+    except FileNotFoundError:
+        return
+
+    init_depth = 4
+    dirs = deque([(root, init_depth)])
+    while dirs:
+        directory, depth = dirs.pop()
         depth -= 1
         with os.scandir(directory) as iterator:
             for f in iterator:
-                if f.is_dir() and depth > 0:
-                    recursive(f.path, depth)
-                elif f.name.startswith('temp_') and f.name.endswith('.pqw6'):
-                    os.remove(f)
-
-    init_depth = 4
-    recursive(os.path.join(PROJECT_DIR, 'autopts/workspaces'), init_depth)
+                if f.name.startswith('temp_') and f.name.endswith('.pqw6'):
+                    os.remove(f.path)
+                elif depth > 0 and f.is_dir(follow_symlinks=False):
+                    dirs.append((f.path, depth))
 
 
 def power_dongle(ykush_port, on=True):
@@ -228,20 +480,27 @@ class SuperGuard(threading.Thread):
         self.timeout = timeout
         self.end = False
         self.was_timeout = False
+        self._stop_event = threading.Event()
 
     def run(self):
         while not self.end:
-            idle_num = 0
-            for srv in self.servers:
-                if time.time() - srv.last_start() > self.timeout:
-                    idle_num += 1
-
-            if idle_num == len(self.servers) and idle_num != 0:
-                log('Superguard timeout, recovering')
-                for srv in self.servers:
-                    srv.request_recovery()
-                self.was_timeout = True
-            sleep(5)
+            servers = list(self.servers)
+            wait = 5
+            if servers:
+                # All servers are idle once the most recently started one is.
+                # Start times only move forward, so sleeping until then and
+                # checking again is enough.
+                deadline = max(srv.last_start() for srv in servers) + self.timeout
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    log('Superguard timeout, recovering')
+                    for srv in servers:
+                        srv.request_recovery()
+                    self.was_timeout = True
+                    wait = 5
+
+            if self._stop_event.wait(wait):
+                break
 
     def clear(self):
         self.servers.clear()
@@ -252,12 +511,14 @@ class SuperGuard(threading.Thread):
 
     def terminate(self):
         self.end = True
+        self._stop_event.set()
 
 
 class Server(threading.Thread):
-    def __init__(self, _args=None):
+    def __init__(self, _args=None, queue=None):
         threading.Thread.__init__(self, daemon=True)
         self.server = None
+        self.queue = queue
         self._args = _args
         self.pts = None
         self._device = None
@@ -265,6 +526,14 @@ class Server(threading.Thread):
         self.recovery_request = False
         self.name = 'S-' + str(self._args.srv_port)
         self.is_ready = False
+        self._tree_lock = threading.Lock()
+        self._tree_cursors = itertools.count(1)
+        self._tree_iterators = {}
+        # Request threads are not COM initialized, process kills run on these
+        # workers instead, so the WMI fallback of kill_all_processes works
+        self._kill_executor = ThreadPoolExecutor(max_workers=2,
+                                                 thread_name_prefix=self.name + '-kill',
+                                                 initializer=pythoncom.CoInitialize)
         if self._args.ykush and type(self._args.ykush) is list:
             self._args.ykush = ' '.join(self._args.ykush)
 
@@ -272,14 +541,13 @@ class Server(threading.Thread):
         try:
             return self.pts.last_start_time
         except:
-            return time.time()
+            return time.monotonic()
 
     def main(self, _args):
         """Main."""
         pythoncom.CoInitialize()
 
-        c = wmi.WMI()
-        for iface in c.Win32_NetworkAdapterConfiguration(IPEnabled=True):
+        for iface in _wmi().Win32_NetworkAdapterConfiguration(IPEnabled=True):
             print("Local IP address: %s DNS %r" % (iface.IPAddress, iface.DNSDomain))
 
         while not self.end:
@@ -287,8 +555,7 @@ class Server(threading.Thread):
             try:
                 self.server_init()
                 self.is_ready = True
-                while not self.end and not self.recovery_request:
-                    self.server.handle_request()
+                self.serve()
             except Exception as e:
                 logging.exception(e)
                 kill_all_processes('PTS.exe')
@@ -296,10 +563,30 @@ class Server(threading.Thread):
             ptscontrol.set_stop_pts(False)
             self.is_ready = False
 
+        self._kill_executor.shutdown(wait=False)
         return 0
 
+    def serve(self):
+        """Serves requests until recovery or end is requested. PTS calls are
+        executed in this thread, other requests in their own threads"""
+        server_thread = threading.Thread(target=self.server.serve_forever,
+                                         name=self.name + '-rpc', daemon=True)
+        server_thread.start()
+        try:
+            while not self.end and not self.recovery_request:
+                self.server.handle_instance_call(timeout=1.0)
+        finally:
+            self.server.shutdown()
+            self.server.reject_requests()
+            self.server.close_connections()
+
     @server_start_lock_wrapper
     def server_init(self):
+        clear_workspace_cache()
+
+        with self._tree_lock:
+            self._tree_iterators.clear()
+
         if self.pts:
             self.pts.stop_pts()
             self.pts.delete_temp_workspace()
@@ -327,17 +614,22 @@ class Server(threading.Thread):
 
         print("Serving on port {} ...".format(self._args.srv_port))
 
-        self.server = xmlrpc.server.SimpleXMLRPCServer(("", self._args.srv_port), allow_none=True)
+        self.server = ThreadingXMLRPCServer(("", self._args.srv_port),
+                                            requestHandler=KeepAliveRequestHandler,
+                                            allow_none=True)
         self.server.register_function(self.request_recovery, 'request_recovery')
         self.server.register_function(self.list_workspace_tree, 'list_workspace_tree')
+        self.server.register_function(self.list_workspace_tree_page, 'list_workspace_tree_page')
         self.server.register_function(self.copy_file, 'copy_file')
+        self.server.register_function(self.copy_file_chunk, 'copy_file_chunk')
+        self.server.register_function(self.file_size, 'file_size')
+        self.server.register_function(self.get_download_url, 'get_download_url')
         self.server.register_function(self.delete_file, 'delete_file')
         self.server.register_function(self.ready, 'ready')
         self.server.register_function(self.get_system_model, 'get_system_model')
         self.server.register_function(self.shutdown_pts_bpv, 'shutdown_pts_bpv')
         self.server.register_instance(self.pts)
         self.server.register_introspection_functions()
-        self.server.timeout = 1.0
 
     def run(self):
         try:
@@ -346,12 +638,20 @@ class Server(threading.Thread):
             self.end = True
             logging.exception(exc)
             print('Server ', str(self._args.srv_port), ' finished')
+            if self.queue:
+                self.queue.put(exc)
 
     def request_recovery(self):
         self.is_ready = False
         self.recovery_request = True
         ptscontrol.set_stop_pts(True)
 
+        # Stop serving the old PTS instance at once, clients see the server
+        # as unavailable until it is restarted
+        server = self.server
+        if server:
+            server.reject_requests()
+
     def terminate(self):
         self.is_ready = False
         self.end = True
@@ -378,20 +678,50 @@ class Server(threading.Thread):
         return 'Unknown'
 
     def list_workspace_tree(self, workspace_dir):
-        if Path(workspace_dir).is_absolute():
-            logs_root = workspace_dir
-        else:
-            logs_root = get_workspace(workspace_dir)
-
-        file_list = []
-        for root, dirs, files in os.walk(logs_root,
-                                         topdown=False):
-            for name in files:
-                file_list.append(os.path.join(root, name))
-
-            file_list.append(root)
-
-        return file_list
+        return list(iter_workspace_tree(find_workspace_root(workspace_dir)))
+
+    def list_workspace_tree_page(self, workspace_dir, cursor, limit):
+        """Returns [cursor, paths] with up to limit next paths of
+        list_workspace_tree. Pass None cursor to start listing, None cursor is
+        returned with the last page. Cursors unused for TREE_CURSOR_TIMEOUT
+        seconds are closed."""
+        if limit < 1:
+            raise ValueError('limit must be at least 1, got %r' % (limit,))
+
+        with self._tree_lock:
+            if cursor is None:
+                cursor = next(self._tree_cursors)
+                self._tree_iterators[cursor] = WorkspaceTreeCursor(workspace_dir)
+            self._expire_tree_cursors()
+            tree_cursor = self._tree_iterators.get(cursor)
+
+        if tree_cursor is None:
+            raise ValueError('Unknown or expired cursor %r' % (cursor,))
+
+        with tree_cursor.lock:
+            file_list = list(itertools.islice(tree_cursor.iterator, limit))
+            tree_cursor.last_used = time.monotonic()
+
+        if len(file_list) < limit:
+            with self._tree_lock:
+                self._tree_iterators.pop(cursor, None)
+            cursor = None
+
+        return [cursor, file_list]
+
+    def _expire_tree_cursors(self):
+        """Closes cursors not used for TREE_CURSOR_TIMEOUT seconds and the
+        oldest ones above TREE_CURSORS_MAX, must be called with _tree_lock"""
+        now = time.monotonic()
+        excess = len(self._tree_iterators) - TREE_CURSORS_MAX
+        for cursor, tree_cursor in sorted(self._tree_iterators.items(),
+                                          key=lambda item: item[1].last_used):
+            if excess <= 0 and now - tree_cursor.last_used < TREE_CURSOR_TIMEOUT:
+                break
+
+            if tree_cursor.close():
+                del self._tree_iterators[cursor]
+                excess -= 1
 
     def copy_file(self, file_path):
         file_bin = None
@@ -400,6 +730,26 @@ class Server(threading.Thread):
                 file_bin = xmlrpc.client.Binary(handle.read())
         return file_bin
 
+    def copy_file_chunk(self, file_path, offset, size):
+        file_bin = None
+        if os.path.isfile(file_path):
+            with open(file_path, 'rb') as handle:
+                handle.seek(offset)
+                file_bin = xmlrpc.client.Binary(handle.read(size))
+        return file_bin
+
+    def file_size(self, file_path):
+        if os.path.isfile(file_path):
+            return os.path.getsize(file_path)
+        return None
+
+    def get_download_url(self, file_path):
+        """Returns URL path the file can be downloaded from with HTTP GET,
+        relative to the server address"""
+        if os.path.isfile(file_path):
+            return '/file?' + urllib.parse.urlencode({'path': file_path})
+        return None
+
     def delete_file(self, file_path):
         if os.path.isfile(file_path):
             os.remove(file_path)
@@ -407,35 +757,98 @@ class Server(threading.Thread):
             shutil.rmtree(file_path, ignore_errors=True)
 
     def shutdown_pts_bpv(self):
-        kill_all_processes('PTS.exe')
-        kill_all_processes('Fts.exe')
-
+        futures = [self._kill_executor.submit(kill_all_processes, name)
+                   for name in ('PTS.exe', 'Fts.exe')]
+        for future in futures:
+            future.result()
 
-def multi_main(_args, _superguard):
-    """Multi server main."""
 
-    servers = []
+def split_args(_args):
+    """Yields arguments of each server"""
     for i in range(len(_args.srv_port)):
-        args_copy = copy.deepcopy(_args)
+        args_copy = argparse.Namespace(**vars(_args))
         args_copy.srv_port = _args.srv_port[i]
         args_copy.ykush = _args.ykush[i] if _args.ykush else None
         args_copy.dongle = _args.dongle[i] if _args.dongle else None
-        srv = Server(_args=args_copy)
+        yield args_copy
+
+
+def wait_for_failure(_queue, workers):
+    """Blocks until one of the server threads or processes fails"""
+    # The timeout only bounds the liveness check of servers that died
+    # silently.
+    while True:
+        try:
+            _queue.get(timeout=2)
+            break
+        except Empty:
+            if not all(w.is_alive() for w in workers):
+                break
+
+
+def serve_one(_args, _queue, start_lock, log_filename):
+    """Server process main."""
+    global PTS_START_LOCK
+    PTS_START_LOCK = start_lock
+
+    logging.basicConfig(format=LOG_FORMAT,
+                        filename=log_filename,
+                        filemode='w',
+                        level=logging.DEBUG)
+
+    server = Server(_args)
+    superguard = SuperGuard(float(_args.superguard))
+    superguard.add_server(server)
+    if _args.superguard:
+        superguard.start()
+
+    try:
+        server.main(_args)
+    except BaseException as exc:
+        logging.exception(exc)
+        _queue.put(str(exc))
+
+
+def multi_main(_args, _superguard):
+    """Multi server main."""
+
+    servers = []
+    _queue = SimpleQueue()
+    for args_copy in split_args(_args):
+        srv = Server(_args=args_copy, queue=_queue)
         servers.append(srv)
         srv.start()
-        superguard.add_server(srv)
+        _superguard.add_server(srv)
 
-    all_alive = True
-    while all_alive:
-        for s in servers:
-            if not s.is_alive():
-                all_alive = False
-        sleep(5)
+    wait_for_failure(_queue, servers)
 
     for s in servers:
         s.terminate()
 
 
+def multi_process_main(_args, log_name):
+    """Multi server main, each server runs in its own process and owns its
+    COM apartment and GIL."""
+
+    processes = []
+    _queue = multiprocessing.Queue()
+    start_lock = multiprocessing.RLock()
+    for args_copy in split_args(_args):
+        log_filename = '{}_{}.log'.format(log_name, args_copy.srv_port)
+        proc = multiprocessing.Process(target=serve_one,
+                                       args=(args_copy, _queue, start_lock,
+                                             log_filename),
+                                       name='S-' + str(args_copy.srv_port),
+                                       daemon=True)
+        processes.append(proc)
+        proc.start()
+
+    wait_for_failure(_queue, processes)
+
+    for proc in processes:
+        proc.terminate()
+
+
 if __name__ == "__main__":
     winutils.exit_if_admin()
     _args = SvrArgumentParser("PTS automation server").parse_args()
@@ -444,15 +857,26 @@ if __name__ == "__main__":
     script_name_no_ext = os.path.splitext(script_name)[0]
 
     log_filename = script_name_no_ext + '.log'
-    format_template = '%(threadName)s %(asctime)s %(name)s %(levelname)s : %(message)s'
 
-    logging.basicConfig(format=format_template,
+    if _args.multiprocess:
+        # Remove per server logs left by previous runs, skip the ones still
+        # opened by other server instances
+        log_prefix = script_name_no_ext + '_'
+        with os.scandir() as iterator:
+            for f in iterator:
+                if f.name.startswith(log_prefix) and f.name.endswith('.log'):
+                    try:
+                        os.remove(f.path)
+                    except OSError:
+                        pass
+
+    logging.basicConfig(format=LOG_FORMAT,
                         filename=log_filename,
                         filemode='w',
                         level=logging.DEBUG)
 
     superguard = SuperGuard(float(_args.superguard))
-    if _args.superguard:
+    if _args.superguard and not _args.multiprocess:
         superguard.start()
 
     if _args.ykush:
@@ -465,6 +889,8 @@ if __name__ == "__main__":
             superguard.add_server(server)
 
             server.main(_args)  # Run server in main process
+        elif _args.multiprocess:
+            multi_process_main(_args, script_name_no_ext)  # Run many servers in processes
         else:
             multi_main(_args, superguard)  # Run many servers in threads
 
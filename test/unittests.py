@@ -1,4 +1,59 @@
+import os
+import socket
+import sys
+import time
+import types
 import unittest
+import xmlrpc.client
+from argparse import Namespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def stub_windows_modules():
+    """Provide stand-ins of Windows only modules, so that the server can be
+    imported on any host"""
+    class ConnectableServer:
+        _public_methods_ = []
+
+    win32com = types.ModuleType('win32com')
+    win32com.client = types.ModuleType('win32com.client')
+    win32com.server = types.ModuleType('win32com.server')
+    win32com.server.connect = types.ModuleType('win32com.server.connect')
+    win32com.server.connect.ConnectableServer = ConnectableServer
+    win32com.server.util = types.ModuleType('win32com.server.util')
+
+    modules = {
+        'pythoncom': mock.MagicMock(),
+        'wmi': mock.MagicMock(),
+        'win32com': win32com,
+        'win32com.client': win32com.client,
+        'win32com.server': win32com.server,
+        'win32com.server.connect': win32com.server.connect,
+        'win32com.server.util': win32com.server.util,
+    }
+
+    for name, module in modules.items():
+        sys.modules.setdefault(name, module)
+
+
+class FakePTS:
+    def __init__(self, device):
+        self._device = device
+        self.last_start_time = time.monotonic()
+
+    def stop_pts(self):
+        pass
+
+    def delete_temp_workspace(self):
+        pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
 
 
 class MyTestCase(unittest.TestCase):
@@ -6,5 +61,57 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(True, True)  # add assertion here
 
 
+class ServerRecoveryTestCase(unittest.TestCase):
+    def setUp(self):
+        stub_windows_modules()
+        import autoptsserver
+        self.autoptsserver = autoptsserver
+
+        patcher = mock.patch.object(autoptsserver, 'PyPTSWithXmlRpcCallback', FakePTS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        port = free_port()
+        self.server = autoptsserver.Server(Namespace(srv_port=port, ykush=None,
+                                                     dongle=None, superguard=0))
+        self.server.start()
+        self.addCleanup(self.stop_server)
+
+        self.proxy = xmlrpc.client.ServerProxy(
+            'http://127.0.0.1:{}/'.format(port), allow_none=True)
+        self.addCleanup(self.proxy('close'))
+
+    def stop_server(self):
+        self.server.terminate()
+        self.server.join(timeout=5)
+        if self.server.server:
+            self.server.server.server_close()
+
+    def wait_for_ready(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if self.proxy.ready():
+                    return
+            except Exception:
+                pass
+            time.sleep(0.1)
+        self.fail('Server not ready')
+
+    def test_ready_after_request_recovery(self):
+        self.wait_for_ready()
+        old_pts = self.server.pts
+
+        self.proxy.request_recovery()
+
+        # Client waits for restart only after an error, a plain False would
+        # let it give up at once and talk to the old PTS instance
+        with self.assertRaises(Exception):
+            self.proxy.ready()
+
+        self.wait_for_ready()
+        self.assertIsNot(self.server.pts, old_pts)
+
+
 if __name__ == '__main__':
     unittest.main()